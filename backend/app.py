@@ -1,5 +1,7 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 import os
+import time
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain.chat_models import init_chat_model
 from dotenv import load_dotenv
@@ -10,6 +12,10 @@ from processing.extract import get_sequential_chain, call_sequential_chain
 from processing.document_splitter import split_text_into_documents, get_embeddings_for_chunks
 from database.chromadb import get_chromadb_collection, add_documents, get_documents_by_url, delete_chromadb_collection
 from rag.rag import build_graph, get_tools
+from metrics.metrics import (
+    REQUEST_LATENCY, render_metrics, token_usage_handler, load_embedding_encoding,
+    start_request_timing, finish_request_timing, format_server_timing,
+)
 
 # Initialize Flask application
 app = Flask(__name__)
@@ -20,16 +26,50 @@ load_dotenv()
 # Retrieve OpenAI API key from environment variables
 openai_key = os.getenv("OPENAI_API_KEY")
 
+# Attach a Server-Timing header with per-stage durations to every response when enabled
+server_timing_enabled = os.getenv("ENABLE_SERVER_TIMING", "false").lower() == "true"
+
+# Count embedding tokens exactly with tiktoken instead of estimating them from text length
+tiktoken_embedding_tokens = os.getenv("TIKTOKEN_EMBEDDING_TOKENS", "false").lower() == "true"
+
 # Initialize language model and embedding model
-llm = ChatOpenAI(model_name="gpt-4o-mini")
+llm = ChatOpenAI(model_name="gpt-4o-mini", callbacks=[token_usage_handler])
 embedding_model = OpenAIEmbeddings(model="text-embedding-3-large")
 sequential_chain = get_sequential_chain(llm=llm, verbose=False)
 
+# Load the tiktoken encoding now, since it is downloaded on first use and must not block a request
+if tiktoken_embedding_tokens and not load_embedding_encoding(embedding_model):
+    app.logger.warning("Could not load the tiktoken encoding; embedding tokens will be estimated")
+
 # Initialize chatbot model and tools
-chat_llm = init_chat_model("gpt-4o-mini", model_provider="openai")
+chat_llm = init_chat_model("gpt-4o-mini", model_provider="openai", callbacks=[token_usage_handler])
 tools = get_tools()
 graph = build_graph(tools=tools)
 
+@app.before_request
+def start_timing():
+    # Start the request clock and begin collecting per-stage timings
+    g.request_start = time.perf_counter()
+    g.timing_token = start_request_timing()
+
+@app.after_request
+def record_timing(response):
+    # Record the end-to-end latency and stop collecting per-stage timings
+    elapsed = time.perf_counter() - g.request_start
+    timings = finish_request_timing(g.timing_token)
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    REQUEST_LATENCY.labels(endpoint=endpoint, status=response.status_code).observe(elapsed)
+
+    # Optionally expose the stage breakdown to the caller
+    if server_timing_enabled:
+        response.headers["Server-Timing"] = format_server_timing(timings + [("total", elapsed)])
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    # Expose latency histograms and token counts in Prometheus text format
+    return Response(render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
 @app.route('/add_and_process_recipe', methods=['POST'])
 def fetch_recipe():
     # Get the recipe URL from the request
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+class FakeTavilyServer:
+    """
+    Local stand-in for the Tavily extract API that serves saved recipe pages.
+
+    A request for any URL whose last path segment is `<name>` returns the contents of
+    `<pages_dir>/<name>.html` as `raw_content`, after sleeping for `latency` seconds.
+    """
+
+    def __init__(self, pages_dir: str, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.pages = load_pages(pages_dir)
+        self.latency = latency
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def extract_url(self):
+        """The URL to use in place of https://api.tavily.com/extract."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/extract"
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down and release its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self):
+        server = self
+
+        class ExtractHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return self._send_json(400, {"detail": {"error": "Request body is not valid JSON"}})
+                if not isinstance(payload, dict):
+                    return self._send_json(400, {"detail": {"error": "Request body must be a JSON object"}})
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                # Tavily accepts a single URL or a list of URLs; a missing or null value means none
+                urls = payload.get("urls") or []
+                if isinstance(urls, str):
+                    urls = [urls]
+                if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+                    return self._send_json(400, {"detail": {"error": "'urls' must be a string or a list of strings"}})
+
+                results = []
+                failed_results = []
+                for url in urls:
+                    page = server.pages.get(page_name(url))
+                    if page is None:
+                        failed_results.append({"url": url, "error": "Page not found"})
+                    else:
+                        results.append({"url": url, "raw_content": page})
+
+                self._send_json(200, {"results": results, "failed_results": failed_results})
+
+            def _send_json(self, status, data):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output free of access logs
+
+        return ExtractHandler
+
+def load_pages(pages_dir: str):
+    """
+    Load saved recipe pages from a directory.
+
+    Args:
+        pages_dir (str): Directory containing `<name>.html` files.
+
+    Returns:
+        dict: A mapping from page name to raw HTML.
+    """
+    pages = {}
+    for filename in sorted(os.listdir(pages_dir)):
+        name, ext = os.path.splitext(filename)
+        if ext == ".html":
+            with open(os.path.join(pages_dir, filename), encoding="utf-8") as f:
+                pages[name] = f.read()
+    return pages
+
+def page_name(url: str):
+    """Return the saved page name for a recipe URL (its last path segment)."""
+    return urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
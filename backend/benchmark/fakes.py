@@ -0,0 +1,122 @@
+import hashlib
+import json
+import math
+import time
+from typing import List
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# Canned structured outputs for each extraction stage, keyed by a phrase from its system prompt
+EXTRACTION_RESPONSES = [
+    ("recipe parser", {
+        "name": "Benchmark Recipe",
+        "cuisine": "American",
+        "category": "Main Course",
+        "servings": 4,
+        "prep_time": 15,
+        "cook_time": 30,
+        "total_time": 45,
+        "difficulty": "Easy",
+        "ingredients": ["2 cups flour", "1 cup milk", "2 eggs"],
+        "instructions": ["Mix the ingredients.", "Bake for 30 minutes."],
+        "diet_labels": ["Vegetarian"],
+        "author_tips": ["Let it rest before serving."],
+    }),
+    ("nutrition assistant", {"calories": 420, "protein": 12, "carbs": 55, "fat": 14}),
+    ("required equipment", {"equipment": ["mixing bowl", "oven"], "optional_equipment": ["stand mixer"]}),
+    ("preparation steps", {"prep_instructions": ["Preheat the oven.", "Measure the flour."]}),
+]
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic stand-in for the OpenAI chat model.
+
+    Returns canned JSON for the extraction prompts, a `retrieve` tool call when tools are bound,
+    and a short answer otherwise, after sleeping for `latency` seconds.
+    """
+    latency: float = 0.0  # Simulated response time in seconds
+    model_name: str = "fake-chat"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools, **kwargs):
+        """Bind tools the same way the OpenAI chat model does, so tool calls can be simulated."""
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        last_message = messages[-1]
+        if tools and last_message.type == "human":
+            # Ask the graph to run the retrieval tool with the user's query
+            tool_name = tools[0]["function"]["name"]
+            message = AIMessage(
+                content="",
+                tool_calls=[{
+                    "name": tool_name,
+                    "args": {"query": last_message.content},
+                    "id": "call_" + hashlib.sha1(last_message.content.encode("utf-8")).hexdigest()[:12],
+                }],
+            )
+        else:
+            message = AIMessage(content=self._respond(messages))
+
+        # Report approximate token usage so the token counters are exercised
+        input_tokens = sum(len(str(m.content).split()) for m in messages)
+        output_tokens = len(str(message.content).split())
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)], llm_output={"model_name": self.model_name})
+
+    def _respond(self, messages):
+        """Pick a canned response based on the system prompt of the conversation."""
+        system_prompt = " ".join(str(m.content) for m in messages if m.type == "system")
+        for phrase, response in EXTRACTION_RESPONSES:
+            if phrase in system_prompt:
+                return "```json\n" + json.dumps(response) + "\n```"
+        if system_prompt:
+            return "Use room-temperature eggs and bake until golden, about 30 minutes."
+        # Query refinement is sent as a single prompt without a system message
+        return "What are the ingredients and steps for this recipe?"
+
+class FakeEmbeddings(Embeddings):
+    """
+    Deterministic stand-in for the OpenAI embedding model.
+
+    Each text maps to a fixed unit vector derived from its SHA-256 digest, after sleeping for
+    `latency` seconds per call.
+    """
+
+    def __init__(self, size: int = 256, latency: float = 0.0, model: str = "fake-embedding"):
+        self.model = model  # Reported as the model label in token metrics
+        self.size = size  # Dimensionality of the generated vectors
+        self.latency = latency  # Simulated response time in seconds
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def _vector(self, text: str) -> List[float]:
+        """Expand the digest of `text` into a normalized vector of length `size`."""
+        values = []
+        counter = 0
+        while len(values) < self.size:
+            digest = hashlib.sha256(f"{counter}:{text}".encode("utf-8")).digest()
+            values.extend(byte / 255.0 - 0.5 for byte in digest)
+            counter += 1
+        values = values[:self.size]
+        norm = math.sqrt(sum(v * v for v in values)) or 1.0
+        return [v / norm for v in values]
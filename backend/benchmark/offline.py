@@ -0,0 +1,65 @@
+import ipaddress
+import socket
+import threading
+
+_original_getaddrinfo = socket.getaddrinfo
+_original_connect = socket.socket.connect
+_original_connect_ex = socket.socket.connect_ex
+_log_lock = threading.Lock()
+
+def is_local(host):
+    """Return True if `host` names this machine (localhost or a loopback address)."""
+    if host is None:
+        return True
+    if isinstance(host, bytes):
+        host = host.decode("ascii", "replace")
+    if host.lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.split("%", 1)[0]).is_loopback
+    except ValueError:
+        return False
+
+def install(log_path: str):
+    """
+    Block network access to anything but this machine for the rest of the process.
+
+    DNS lookups and connections to other hosts raise OSError, and each blocked host is appended to
+    `log_path` so the benchmark can fail the run.
+
+    Args:
+        log_path (str): File that blocked hosts are appended to, one per line.
+    """
+    def block(host):
+        with _log_lock, open(log_path, "a") as f:
+            f.write(f"{host}\n")
+        raise OSError(f"Network access to {host} is blocked during the offline benchmark")
+
+    def getaddrinfo(host, *args, **kwargs):
+        if not is_local(host):
+            block(host)
+        return _original_getaddrinfo(host, *args, **kwargs)
+
+    def check(sock, address):
+        if sock.family in (socket.AF_INET, socket.AF_INET6) and not is_local(address[0]):
+            block(address[0])
+
+    def connect(self, address):
+        check(self, address)
+        return _original_connect(self, address)
+
+    def connect_ex(self, address):
+        check(self, address)
+        return _original_connect_ex(self, address)
+
+    socket.getaddrinfo = getaddrinfo
+    socket.socket.connect = connect
+    socket.socket.connect_ex = connect_ex
+
+def blocked_hosts(log_path: str):
+    """Return the distinct hosts recorded in `log_path`, in the order they were first blocked."""
+    try:
+        with open(log_path) as f:
+            return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+    except FileNotFoundError:
+        return []
@@ -0,0 +1,299 @@
+"""
+Offline end-to-end benchmark for the recipe backend.
+
+Drives /add_and_process_recipe, /get_documents_for_recipe and /chat under configurable concurrency,
+with Tavily and OpenAI replaced by local deterministic stand-ins and ChromaDB in a temporary directory.
+The backend runs in its own process (benchmark.server), so this process only generates load and
+memory is measured for the backend alone.
+
+Run from the backend directory:
+    python -m benchmark.run_benchmark --requests 50 --concurrency 8
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+from benchmark import offline
+from benchmark.fake_tavily import load_pages
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PAGES_DIR = os.path.join(BACKEND_DIR, "benchmark", "pages")
+
+# Questions cycled through during the chat phase
+CHAT_QUERIES = [
+    "What can I substitute for eggs?",
+    "How long does this take to cook?",
+    "Can I make this ahead of time?",
+    "How should I store leftovers?",
+]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark for the recipe backend.")
+    parser.add_argument("--requests", type=int, default=20, help="Requests sent to each endpoint.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of requests in flight at once.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds before a request counts as an error.")
+    parser.add_argument("--pages-dir", default=DEFAULT_PAGES_DIR, help="Directory of saved recipe pages (*.html).")
+    parser.add_argument("--tavily-latency", type=float, default=0.0, help="Simulated Tavily latency in seconds.")
+    parser.add_argument("--chat-latency", type=float, default=0.0, help="Simulated chat model latency in seconds.")
+    parser.add_argument("--embedding-latency", type=float, default=0.0, help="Simulated embedding latency in seconds.")
+    parser.add_argument("--embedding-size", type=int, default=256, help="Dimensionality of the fake embeddings.")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this JSON file.")
+    return parser.parse_args(argv)
+
+def percentile(values, pct):
+    """
+    Compute a percentile of a list of values using linear interpolation.
+
+    Args:
+        values (List[float]): The observed values.
+        pct (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        float: The interpolated percentile, or 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def current_rss_mb(pid: int):
+    """Return the current resident set size of process `pid` in megabytes, or None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024  # Reported in kilobytes
+    except OSError:
+        pass
+
+    # Fall back to psutil where /proc is not available (e.g. macOS)
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+    except psutil.Error:
+        return None
+
+class RssSampler:
+    """
+    Sample the resident set size of a process on a background thread while a phase runs.
+
+    Records the RSS before the phase (`baseline_mb`) and the highest RSS seen during it (`peak_mb`),
+    so each endpoint's memory growth can be reported separately from earlier phases.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.01):
+        self.pid = pid  # Process to sample
+        self.interval = interval  # Seconds between samples
+        self.baseline_mb = None
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.baseline_mb = self.peak_mb = current_rss_mb(self.pid)
+        if self.baseline_mb is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        rss = current_rss_mb(self.pid)
+        if rss is not None and rss > self.peak_mb:
+            self.peak_mb = rss
+
+def run_phase(name, send, count, concurrency, server_pid):
+    """
+    Send `count` requests with up to `concurrency` in flight and summarize their latency.
+
+    Latency percentiles and throughput only cover successful requests, so fast failures cannot
+    make a broken backend look faster.
+
+    Args:
+        name (str): The endpoint being benchmarked.
+        send (Callable[[requests.Session, int], requests.Response]): Sends the i-th request using the
+            worker's session.
+        count (int): Number of requests to send.
+        concurrency (int): Maximum number of requests in flight.
+        server_pid (int): The backend process whose memory is sampled.
+
+    Returns:
+        dict: Latency percentiles (ms), throughput (req/s), error count and RSS before, at peak and
+            growth during the phase (MB).
+    """
+    # One session per worker thread, so connections are reused without sharing a session across threads
+    local = threading.local()
+
+    def timed_send(i):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            ok = send(local.session, i).status_code < 400
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    with RssSampler(server_pid) as rss:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(timed_send, range(count)))
+        wall = time.perf_counter() - start
+
+    latencies = [latency * 1000 for latency, ok in results if ok]
+    return {
+        "endpoint": name,
+        "requests": count,
+        "errors": count - len(latencies),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+        "rss_baseline_mb": rss.baseline_mb,
+        "rss_peak_mb": rss.peak_mb,
+        "rss_growth_mb": rss.peak_mb - rss.baseline_mb if rss.peak_mb is not None else None,
+    }
+
+def print_results(results):
+    """Print the per-endpoint results as a table."""
+    def mb(value):
+        return f"{value:>12.1f}" if value is not None else f"{'n/a':>12}"
+
+    header = (
+        f"{'endpoint':<28}{'reqs':>6}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ok req/s':>10}"
+        f"{'RSS base MB':>12}{'RSS peak MB':>12}{'RSS +MB':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['endpoint']:<28}{r['requests']:>6}{r['errors']:>8}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+            f"{r['p99_ms']:>10.1f}{r['throughput_rps']:>10.1f}"
+            f"{mb(r['rss_baseline_mb'])}{mb(r['rss_peak_mb'])}{mb(r['rss_growth_mb'])}"
+        )
+    print("Latency and throughput cover successful requests only. RSS is the backend process's, sampled")
+    print("during each phase; 'RSS +MB' is the growth over the RSS measured just before the phase started.")
+
+def start_server(args, chroma_dir, network_log):
+    """
+    Start the backend with its local stand-ins in a subprocess and wait until it accepts requests.
+
+    Returns:
+        Tuple[subprocess.Popen, str]: The server process and its base URL.
+    """
+    command = [
+        sys.executable, "-m", "benchmark.server",
+        "--pages-dir", args.pages_dir,
+        "--chroma-dir", chroma_dir,
+        "--tavily-latency", str(args.tavily_latency),
+        "--chat-latency", str(args.chat_latency),
+        "--embedding-latency", str(args.embedding_latency),
+        "--embedding-size", str(args.embedding_size),
+        "--network-log", network_log,
+    ]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.PIPE, text=True)
+
+    # The server prints "READY <port>" once it is listening
+    for line in process.stdout:
+        if line.startswith("READY "):
+            return process, f"http://127.0.0.1:{int(line.split()[1])}"
+    process.wait()
+    sys.exit(f"Benchmark server exited with code {process.returncode} before it was ready")
+
+def stop_server(process):
+    """Stop the backend subprocess, killing it if it does not exit promptly."""
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    page_names = sorted(load_pages(args.pages_dir))
+    if not page_names:
+        sys.exit(f"No *.html pages found in {args.pages_dir}")
+
+    # Run the backend in its own process against a throwaway ChromaDB directory. Both processes block
+    # network access outside this machine and record any attempt in the same log
+    work_dir = tempfile.mkdtemp(prefix="recipe-benchmark-")
+    chroma_dir = os.path.join(work_dir, "chroma")
+    network_log = os.path.join(work_dir, "blocked-hosts.log")
+    offline.install(network_log)
+    server, base_url = start_server(args, chroma_dir, network_log)
+
+    # Each request adds a distinct recipe URL, cycling through the saved pages
+    recipe_urls = [f"https://recipes.benchmark/{i}/{page_names[i % len(page_names)]}" for i in range(args.requests)]
+
+    try:
+        results = [
+            run_phase(
+                "/add_and_process_recipe",
+                lambda session, i: session.post(
+                    f"{base_url}/add_and_process_recipe", params={"url": recipe_urls[i]}, timeout=args.timeout,
+                ),
+                args.requests, args.concurrency, server.pid,
+            ),
+            run_phase(
+                "/get_documents_for_recipe",
+                lambda session, i: session.get(
+                    f"{base_url}/get_documents_for_recipe", params={"url": recipe_urls[i]}, timeout=args.timeout,
+                ),
+                args.requests, args.concurrency, server.pid,
+            ),
+            run_phase(
+                "/chat",
+                lambda session, i: session.get(
+                    f"{base_url}/chat",
+                    params={"url": recipe_urls[i], "query": CHAT_QUERIES[i % len(CHAT_QUERIES)]},
+                    timeout=args.timeout,
+                ),
+                args.requests, args.concurrency, server.pid,
+            ),
+        ]
+    finally:
+        stop_server(server)
+        blocked = offline.blocked_hosts(network_log)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_results(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+    # Fail the run so a broken backend is never mistaken for a fast one
+    errors = sum(r["errors"] for r in results)
+    if errors:
+        sys.exit(f"Benchmark failed: {errors} request(s) returned an error")
+
+    # Fail the run if anything tried to leave this machine, since its timings depend on the network
+    if blocked:
+        sys.exit(f"Benchmark failed: blocked network access to {', '.join(blocked)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Backend process for the offline benchmark.
+
+Starts the fake Tavily server, points the backend at it and at the given ChromaDB directory, swaps in
+the fake chat and embedding models and serves the Flask app on a free local port. Prints
+"READY <port>" on stdout once it accepts requests. Started by benchmark.run_benchmark, which keeps
+only the load generator in its own process.
+"""
+import argparse
+import logging
+import os
+
+from benchmark import offline
+from benchmark.fake_tavily import FakeTavilyServer
+from benchmark.fakes import FakeChatModel, FakeEmbeddings
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the recipe backend with local stand-ins for Tavily and OpenAI.")
+    parser.add_argument("--pages-dir", required=True, help="Directory of saved recipe pages (*.html).")
+    parser.add_argument("--chroma-dir", required=True, help="Directory for the ChromaDB data.")
+    parser.add_argument("--tavily-latency", type=float, default=0.0, help="Simulated Tavily latency in seconds.")
+    parser.add_argument("--chat-latency", type=float, default=0.0, help="Simulated chat model latency in seconds.")
+    parser.add_argument("--embedding-latency", type=float, default=0.0, help="Simulated embedding latency in seconds.")
+    parser.add_argument("--embedding-size", type=int, default=256, help="Dimensionality of the fake embeddings.")
+    parser.add_argument("--network-log", required=True, help="File that blocked non-local hosts are appended to.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Block and record any network access outside this machine before the backend is imported
+    offline.install(args.network_log)
+
+    # Start the fake Tavily server and point the backend at it and at the benchmark's ChromaDB directory
+    tavily = FakeTavilyServer(args.pages_dir, latency=args.tavily_latency).start()
+    os.environ.update({
+        "TAVILY_EXTRACT_URL": tavily.extract_url,
+        "TAVILY_API_KEY": "benchmark",
+        "OPENAI_API_KEY": "benchmark",
+        "CHROMA_DB_PATH": args.chroma_dir,
+        "LANGSMITH_TRACING": "false",
+        "ANONYMIZED_TELEMETRY": "False",  # ChromaDB usage telemetry
+        "TIKTOKEN_EMBEDDING_TOKENS": "false",  # Estimate embedding tokens instead of downloading an encoding
+    })
+
+    # Import the backend only after the environment is set, then swap in the fake models
+    import app as backend
+    from processing.extract import get_sequential_chain
+    from rag import rag
+    from metrics.metrics import token_usage_handler
+
+    chat_model = FakeChatModel(latency=args.chat_latency, callbacks=[token_usage_handler])
+    embedding_model = FakeEmbeddings(size=args.embedding_size, latency=args.embedding_latency)
+    backend.embedding_model = embedding_model
+    backend.sequential_chain = get_sequential_chain(llm=chat_model, verbose=False)
+    rag.llm = chat_model
+    rag.embedding_function = embedding_model
+
+    from werkzeug.serving import make_server
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # Keep access logs out of the results
+    server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+
+    # Tell the driver which port to send requests to
+    print(f"READY {server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        tavily.stop()
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,32 @@
+import os
+import threading
 import chromadb  # Import the chromadb library for database operations
+from metrics.metrics import timed
+
+# Directory where ChromaDB stores its data, overridable for benchmarks and local experiments
+chroma_db_path = os.getenv("CHROMA_DB_PATH", "./chroma_db")
+
+# Persistent clients keyed by path, reused across requests instead of being reopened each time
+_clients = {}
+_clients_lock = threading.Lock()  # Concurrent first-time client creation for the same path fails
+
+def get_chromadb_client(path: str = None):
+    """
+    Return a persistent ChromaDB client for the given path, creating it on first use.
+
+    Args:
+        path (str): The directory where ChromaDB stores its data. Defaults to `chroma_db_path`.
+
+    Returns:
+        ClientAPI: The persistent ChromaDB client.
+    """
+    path = path or chroma_db_path
+    with _clients_lock:
+        client = _clients.get(path)
+        if client is None:
+            client = chromadb.PersistentClient(path=path)  # Create a persistent client with the specified path
+            _clients[path] = client
+    return client
 
 def get_chromadb_collection():
     """
@@ -7,10 +35,11 @@ def get_chromadb_collection():
     Returns:
         Collection: The ChromaDB collection for storing recipe documents.
     """
-    client = chromadb.PersistentClient(path="./chroma_db")  # Create a persistent client with the specified path
+    client = get_chromadb_client()  # Reuse the persistent client
     collection = client.get_or_create_collection("recipes")  # Get or create the 'recipes' collection
     return collection  # Return the collection
 
+@timed("chroma.add")
 def add_documents(collection, embeddings, docs, recipe_url):
     """
     Add documents to the ChromaDB collection with associated metadata.
@@ -30,6 +59,7 @@ def add_documents(collection, embeddings, docs, recipe_url):
             metadatas=[{"recipe_url": recipe_url, "chunk_index": i}]  # Metadata including recipe URL and chunk index
         )
 
+@timed("chroma.get")
 def get_documents_by_url(collection, recipe_url: str):
     """
     Retrieve documents from the ChromaDB collection by recipe URL.
@@ -51,5 +81,5 @@ def delete_chromadb_collection():
     """
     Delete the ChromaDB collection for recipes.
     """
-    client = chromadb.PersistentClient(path="./chroma_db")  # Create a persistent client with the specified path
+    client = get_chromadb_client()  # Reuse the persistent client
     client.delete_collection("recipes")  # Delete the 'recipes' collection
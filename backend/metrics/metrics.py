@@ -0,0 +1,220 @@
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+import tiktoken
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import Counter, Histogram, generate_latest
+
+# Latency buckets in seconds, stretched past the Prometheus defaults to cover slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+# Per-request list of (stage, seconds) pairs, used to build the Server-Timing header
+_request_timings = ContextVar("request_timings", default=None)
+
+# Time spent in stages nested inside the innermost running stage, used to report its self time
+_child_seconds = ContextVar("child_seconds", default=None)
+
+# Metrics exported by the backend
+STAGE_LATENCY = Histogram(
+    "recipe_stage_latency_seconds",
+    "Latency of individual pipeline stages (scraping, extraction, embedding, ChromaDB, graph nodes).",
+    ["stage"],
+    buckets=DEFAULT_BUCKETS,
+)
+REQUEST_LATENCY = Histogram(
+    "recipe_request_latency_seconds",
+    "End-to-end latency of HTTP requests by endpoint.",
+    ["endpoint", "status"],
+    buckets=DEFAULT_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "recipe_llm_tokens_total",
+    "Tokens consumed by chat and embedding model calls.",
+    ["model", "type"],
+)
+
+def render_metrics():
+    """
+    Render every registered metric in Prometheus text exposition format.
+
+    Returns:
+        bytes: The metrics page served by the /metrics endpoint.
+    """
+    return generate_latest()
+
+def observe_stage(stage: str, seconds: float, child_seconds: float = 0.0):
+    """
+    Record the duration of a pipeline stage.
+
+    The histogram gets the full duration. The request's timings get only the time not spent in
+    nested stages, under `<stage>.self`, so Server-Timing entries do not count time twice.
+
+    Args:
+        stage (str): The name of the stage (e.g. "tavily.extract").
+        seconds (float): How long the stage took.
+        child_seconds (float): How much of that time was spent in stages nested inside it.
+    """
+    STAGE_LATENCY.labels(stage=stage).observe(seconds)
+
+    # Also attribute the stage to the current request, if one is being timed
+    timings = _request_timings.get()
+    if timings is not None:
+        if child_seconds:
+            timings.append((f"{stage}.self", seconds - child_seconds))
+        else:
+            timings.append((stage, seconds))
+
+    # Credit the time to the enclosing stage, if there is one
+    parent = _child_seconds.get()
+    if parent is not None:
+        parent[0] += seconds
+
+@contextmanager
+def timed(stage: str):
+    """
+    Time the wrapped block or function and record it under `stage`.
+
+    Usable both as `with timed("split"):` and as a `@timed("split")` decorator.
+    """
+    children = [0.0]  # Seconds spent in nested stages
+    token = _child_seconds.set(children)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _child_seconds.reset(token)
+        observe_stage(stage, elapsed, children[0])
+
+def start_request_timing():
+    """Begin collecting stage timings for the current request."""
+    return _request_timings.set([])
+
+def finish_request_timing(token):
+    """
+    Stop collecting stage timings for the current request.
+
+    Args:
+        token: The token returned by `start_request_timing`.
+
+    Returns:
+        List[Tuple[str, float]]: The (stage, seconds) pairs recorded during the request.
+    """
+    timings = _request_timings.get() or []
+    _request_timings.reset(token)
+    return timings
+
+def format_server_timing(timings):
+    """
+    Format stage timings as a Server-Timing header value.
+
+    Args:
+        timings (List[Tuple[str, float]]): The (stage, seconds) pairs for a request.
+
+    Returns:
+        str: The header value, with durations in milliseconds.
+    """
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings)
+
+class StageTimer(BaseCallbackHandler):
+    """Callback handler that records the latency of the chain it is attached to as a stage."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._starts = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, **kwargs):
+        self._starts[run_id] = time.perf_counter()
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def _finish(self, run_id):
+        start = self._starts.pop(run_id, None)
+        if start is not None:
+            observe_stage(self.stage, time.perf_counter() - start)
+
+class TokenUsageCallbackHandler(BaseCallbackHandler):
+    """Callback handler that counts input and output tokens reported by chat model calls."""
+
+    def on_llm_end(self, response, **kwargs):
+        llm_output = response.llm_output or {}
+        model = llm_output.get("model_name", "unknown")
+
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+
+        # Fall back to the provider's aggregate usage when messages carry none
+        if not input_tokens and not output_tokens:
+            token_usage = llm_output.get("token_usage") or {}
+            input_tokens = token_usage.get("prompt_tokens", 0)
+            output_tokens = token_usage.get("completion_tokens", 0)
+
+        if input_tokens:
+            LLM_TOKENS.labels(model=model, type="input").inc(input_tokens)
+        if output_tokens:
+            LLM_TOKENS.labels(model=model, type="output").inc(output_tokens)
+
+# tiktoken encodings by embedding model name, filled once at startup by `load_embedding_encoding`
+_encodings = {}
+
+def _embedding_model_name(embedding_model):
+    """Return the model name used to label an embedding model's token counts."""
+    return getattr(embedding_model, "model", None) or type(embedding_model).__name__
+
+def load_embedding_encoding(embedding_model):
+    """
+    Load the tiktoken encoding used to count exact tokens for an embedding model.
+
+    tiktoken downloads its encoding files on first use, so call this once at startup rather than
+    inside a request. A failed load is not remembered, so calling it again retries.
+
+    Args:
+        embedding_model (Embeddings): The embedding model whose tokens should be counted exactly.
+
+    Returns:
+        bool: True if the encoding was loaded, False if tokens will keep being estimated.
+    """
+    model = _embedding_model_name(embedding_model)
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")  # Models tiktoken does not know about
+    except Exception:
+        return False  # The encoding files could not be downloaded, e.g. when offline
+    _encodings[model] = encoding
+    return True
+
+def record_embedding_tokens(embedding_model, texts):
+    """
+    Count the tokens sent to an embedding model.
+
+    Embedding responses carry no usage data through LangChain, so tokens are estimated at four
+    characters per token, or counted exactly if `load_embedding_encoding` has loaded an encoding.
+
+    Args:
+        embedding_model (Embeddings): The embedding model the texts were sent to.
+        texts (List[str]): The embedded texts.
+    """
+    model = _embedding_model_name(embedding_model)
+    encoding = _encodings.get(model)
+    if encoding is None:
+        tokens = sum(math.ceil(len(text) / 4) for text in texts)
+    else:
+        tokens = sum(len(encoding.encode_ordinary(text)) for text in texts)
+    if tokens:
+        LLM_TOKENS.labels(model=model, type="input").inc(tokens)
+
+# Shared handler instance attached to every chat model
+token_usage_handler = TokenUsageCallbackHandler()
@@ -1,6 +1,8 @@
 from langchain_core.documents import Document  
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from metrics.metrics import timed, record_embedding_tokens
 
+@timed("split")
 def split_text_into_documents(text: str, chunk_size: int = 1000, chunk_overlap: int = 200, add_start_index: bool = True):
     """
     Splits the input text into smaller document chunks.
@@ -38,6 +40,8 @@ def get_embeddings_for_chunks(chunks, embedding_model):
         List: A list of embedded chunks.
     """
     # Embed the document chunks using the provided embedding model
-    embedded_chunks = embedding_model.embed_documents(chunks)
+    with timed("embed.documents"):
+        embedded_chunks = embedding_model.embed_documents(chunks)
+    record_embedding_tokens(embedding_model, chunks)
     
     return embedded_chunks
\ No newline at end of file
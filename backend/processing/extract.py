@@ -7,6 +7,7 @@ from langchain_openai import ChatOpenAI
 
 from models.model import RecipeResponse, RecipeEquipmentResponse, PrepResponse, NutritionResponse
 from models.prompts import get_recipe_prompt, get_equipment_prompt, get_prep_prompt, get_nutrition_prompt
+from metrics.metrics import StageTimer, timed
 
 def get_sequential_chain(llm: ChatOpenAI, verbose: bool = False):
     """
@@ -32,10 +33,10 @@ def get_sequential_chain(llm: ChatOpenAI, verbose: bool = False):
     nutrition_prompt = get_nutrition_prompt(parser_nutrition)
     
     # Create individual LLM chains for each prompt
-    recipe_chain = LLMChain(llm=llm, prompt=recipe_prompt, output_key="recipe")
-    equipment_chain = LLMChain(llm=llm, prompt=equipment_prompt, output_key="equipment")
-    prep_chain = LLMChain(llm=llm, prompt=prep_prompt, output_key="prep")
-    nutrition_chain = LLMChain(llm=llm, prompt=nutrition_prompt, output_key="nutrition")
+    recipe_chain = LLMChain(llm=llm, prompt=recipe_prompt, output_key="recipe", callbacks=[StageTimer("extract.recipe")])
+    equipment_chain = LLMChain(llm=llm, prompt=equipment_prompt, output_key="equipment", callbacks=[StageTimer("extract.equipment")])
+    prep_chain = LLMChain(llm=llm, prompt=prep_prompt, output_key="prep", callbacks=[StageTimer("extract.prep")])
+    nutrition_chain = LLMChain(llm=llm, prompt=nutrition_prompt, output_key="nutrition", callbacks=[StageTimer("extract.nutrition")])
     
     # Combine all chains into a sequential chain
     sequential_chain = SequentialChain(
@@ -59,7 +60,8 @@ def call_sequential_chain(sequential_chain, query):
         dict: A dictionary containing structured outputs for recipe, prep, equipment, and nutrition.
     """
     # Execute the sequential chain with the provided query
-    final_output = sequential_chain({"query": query})
+    with timed("extract.total"):
+        final_output = sequential_chain({"query": query})
     
     # Clean and extract JSON responses from the final output
     recipe_json = clean_json_and_return(final_output['recipe'])
@@ -11,6 +11,7 @@ from langchain_openai import OpenAIEmbeddings
 from langchain.chat_models import init_chat_model
 from database.chromadb import get_chromadb_collection
 from models.prompts import get_chat_prompt
+from metrics.metrics import timed, token_usage_handler, record_embedding_tokens
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -18,27 +19,30 @@ load_dotenv()
 
 # Set environment variables for API keys and user agent
 os.environ['USER_AGENT'] = 'myagent'
-os.environ["LANGSMITH_TRACING"] = "true"
-os.environ["LANGSMITH_API_KEY"] = os.getenv('LANGSMITH_API_KEY')
+# LangSmith tracing is opt-in: set LANGSMITH_TRACING=true and LANGSMITH_API_KEY in .env to enable it
 os.environ["OPENAI_API_KEY"] = os.getenv('OPENAI_API_KEY')
 
 # Initialize embedding function and language model
 embedding_function = OpenAIEmbeddings(model="text-embedding-3-large")
-llm = init_chat_model("gpt-4o-mini", model_provider="openai")
+llm = init_chat_model("gpt-4o-mini", model_provider="openai", callbacks=[token_usage_handler])
 
+@timed("graph.refine_query")
 def refine_query(state: MessagesState):
     """Improve the user's query before retrieval while ensuring it relates to the available recipe data."""
     user_query = state["messages"][-1].content  # Get the last user query
 
     # Generate embedding for the user query
-    query_embedding = embedding_function.embed_query(user_query)
+    with timed("embed.query"):
+        query_embedding = embedding_function.embed_query(user_query)
+    record_embedding_tokens(embedding_function, [user_query])
     collection = get_chromadb_collection()
     
     # Query the database for similar documents
-    retrieved_docs = collection.query(
-        query_embeddings=[query_embedding],  # Querying with the embedding
-        n_results=5,  # Retrieve top 5 most similar documents
-    )
+    with timed("chroma.query"):
+        retrieved_docs = collection.query(
+            query_embeddings=[query_embedding],  # Querying with the embedding
+            n_results=5,  # Retrieve top 5 most similar documents
+        )
 
     # Extract recipe context from retrieved documents
     if retrieved_docs:
@@ -60,16 +64,24 @@ def refine_query(state: MessagesState):
 @tool(response_format="content_and_artifact")
 def retrieve(query):
     """Retrieve information related to a query."""
+    with timed("graph.tools"):
+        return _retrieve(query)
+
+def _retrieve(query):
+    """Embed the query and fetch the most similar recipe chunks from ChromaDB."""
     
     # Generate embedding for the user query
-    query_embedding = embedding_function.embed_query(query)
+    with timed("embed.query"):
+        query_embedding = embedding_function.embed_query(query)
+    record_embedding_tokens(embedding_function, [query])
     collection = get_chromadb_collection()
     
     # Query the database for similar documents
-    retrieved_docs = collection.query(
-        query_embeddings=[query_embedding],  # Querying with the embedding
-        n_results=5,  # Retrieve top 5 most similar documents
-    )
+    with timed("chroma.query"):
+        retrieved_docs = collection.query(
+            query_embeddings=[query_embedding],  # Querying with the embedding
+            n_results=5,  # Retrieve top 5 most similar documents
+        )
     
     # Check if any documents were retrieved
     if not retrieved_docs:
@@ -84,6 +96,7 @@ def retrieve(query):
     
     return serialized, retrieved_docs  # Return serialized content and retrieved documents
 
+@timed("graph.query_or_respond")
 def query_or_respond(state: MessagesState):
     """Generate tool call for recipe retrieval or respond."""
     llm_with_tools = llm.bind_tools([retrieve])  # Bind the retrieval tool
@@ -95,6 +108,7 @@ def get_tools():
     tools = ToolNode([retrieve])  # Create a ToolNode with the retrieve function
     return tools
 
+@timed("graph.generate")
 def generate(state: MessagesState):
     """Generate answer using retrieved recipe details."""
     # Extract recent tool messages (retrieved recipe details)
@@ -3,9 +3,10 @@ import os
 import json
 from bs4 import BeautifulSoup
 import re
+from metrics.metrics import timed
 
 tavily_key = os.getenv("TAVILY_API_KEY")
-tavily_extract_url = "https://api.tavily.com/extract"
+tavily_extract_url = os.getenv("TAVILY_EXTRACT_URL", "https://api.tavily.com/extract")
 
 def extract_raw_html_from_url(url: str):
     
@@ -19,7 +20,8 @@ def extract_raw_html_from_url(url: str):
         "Content-Type": "application/json"
     }
 
-    response = requests.request("POST", tavily_extract_url, json=payload, headers=headers)
+    with timed("tavily.extract"):
+        response = requests.request("POST", tavily_extract_url, json=payload, headers=headers)
     
     byte_data = response._content
     decoded_data = byte_data.decode('utf-8')
@@ -36,6 +38,7 @@ def extract_raw_html_from_url(url: str):
 
     return scraped_text    
 
+@timed("clean_html")
 def clean_html(raw_html: str) -> str:
     soup = BeautifulSoup(raw_html, "html.parser")
     